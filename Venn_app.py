@@ -16,74 +16,119 @@ Created on Thu Oct  2 18:34:01 2025
 import tkinter as tk
 from tkinter import filedialog, colorchooser, messagebox, scrolledtext, ttk
 import pandas as pd
-import matplotlib
-matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# Agg-only at module level: spawned save workers import this module, so the
+# Tk canvas backend is imported under __main__ below
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.patches import Circle
-import os, re, datetime as dt
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing, threading
+import os, re, sys, csv, hashlib, itertools, datetime as dt
+
+VENN_R = 1.5             # circle radius (data units)
+DPI = 100                # saved PNG resolution
+POOL_MIN_WORK = 2_000_000  # est. batch work (cells) before Save All spawns worker processes
+PNG_WORK = 100_000         # one PNG render, counted as cells of set-op/CSV work
 
 # ---------- helpers ----------
+_SANITIZE_RE = re.compile(r"[^\w\-. ]+")
+_SANITIZE_MAX = 60
+
 def sanitize_filename(s: str) -> str:
     s = (s or "").strip()
-    s = re.sub(r"[^\w\-. ]+", "_", s)
-    return s[:60] if len(s) > 60 else s
+    s = _SANITIZE_RE.sub("_", s)
+    return s[:_SANITIZE_MAX]
 
-def compute_sets(seriesA, seriesB):
-    setA = set(seriesA.dropna().astype(str))
-    setB = set(seriesB.dropna().astype(str))
+def compute_sets(colA, colB):
+    # → (unique_A, unique_B, shared), each a sorted list of str
+    setA = frozenset(colA)
+    setB = frozenset(colB)
     unique_A = sorted(setA - setB)
     unique_B = sorted(setB - setA)
     shared   = sorted(setA & setB)
-    return setA, setB, unique_A, unique_B, shared
+    return unique_A, unique_B, shared
 
-def draw_symmetric(ax, setA, setB, la, lb, colorA, colorB, alpha, label_y):
-    # clear & draw
+def draw_symmetric(ax, n_A, n_B, n_shared, la, lb, colorA, colorB, alpha, label_y,
+                   animated=False):
+    # clear & draw; returns the artists so the live canvas can update/blit them
     ax.clear()
-    r = 1.5
+    r = VENN_R
     cx1, cy1 = -0.9, 0
     cx2, cy2 =  0.9, 0
 
     # circles
-    ax.add_patch(Circle((cx1, cy1), r, alpha=alpha, facecolor=colorA, edgecolor="black"))
-    ax.add_patch(Circle((cx2, cy2), r, alpha=alpha, facecolor=colorB, edgecolor="black"))
-
-    unique_A = len(setA - setB)
-    unique_B = len(setB - setA)
-    shared   = len(setA & setB)
+    circA = ax.add_patch(Circle((cx1, cy1), r, alpha=alpha, facecolor=colorA, edgecolor="black",
+                                animated=animated))
+    circB = ax.add_patch(Circle((cx2, cy2), r, alpha=alpha, facecolor=colorB, edgecolor="black",
+                                animated=animated))
 
     # labels above circles
-    ax.text(cx1, r*label_y, la, ha="center", va="bottom", fontsize=13)
-    ax.text(cx2, r*label_y, lb, ha="center", va="bottom", fontsize=13)
+    txtA = ax.text(cx1, r*label_y, la, ha="center", va="bottom", fontsize=13, animated=animated)
+    txtB = ax.text(cx2, r*label_y, lb, ha="center", va="bottom", fontsize=13, animated=animated)
 
     # counts
-    ax.text(cx1 - 0.4, 0, str(unique_A), ha="center", va="center", fontsize=16)
-    ax.text(cx2 + 0.4, 0, str(unique_B), ha="center", va="center", fontsize=16)
-    ax.text(0, 0, str(shared), ha="center", va="center", fontsize=16, fontweight="bold")
+    cntA = ax.text(cx1 - 0.4, 0, str(n_A), ha="center", va="center", fontsize=16, animated=animated)
+    cntB = ax.text(cx2 + 0.4, 0, str(n_B), ha="center", va="center", fontsize=16, animated=animated)
+    cntS = ax.text(0, 0, str(n_shared), ha="center", va="center", fontsize=16, fontweight="bold",
+                   animated=animated)
 
     ax.set_aspect("equal"); ax.set_xlim(-3,3); ax.set_ylim(-2.5,2.5)
     ax.axis("off")
     ax.set_title("Symmetric Venn Diagram (Counts)")
+    return circA, circB, txtA, txtB, cntA, cntB, cntS
 
-def to_results_df(la, lb, unique_A, unique_B, shared):
-    max_len = max(len(unique_A), len(unique_B), len(shared))
-    pad = lambda L: L + [""]*(max_len - len(L))
-    return pd.DataFrame({
-        f"Unique to {la}": pad(unique_A),
-        f"Unique to {lb}": pad(unique_B),
-        "Shared": pad(shared)
-    })
+def write_results_csv(path, la, lb, unique_A, unique_B, shared):
+    # stream ragged columns straight to disk; no padded DataFrame needed.
+    # Written to a temp file and renamed, so a crash never leaves a partial
+    # CSV under its final (content-hash) name.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f, lineterminator=os.linesep)   # to_csv's line endings
+            w.writerow([f"Unique to {la}", f"Unique to {lb}", "Shared"])
+            w.writerows(itertools.zip_longest(unique_A, unique_B, shared, fillvalue=""))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_results_sheet(wb_out, title, la, lb, unique_A, unique_B, shared):
+    # write-only worksheet: rows are streamed out instead of held as cells
+    ws = wb_out.create_sheet(title)
+    ws.append([f"Unique to {la}", f"Unique to {lb}", "Shared"])
+    for row in itertools.zip_longest(unique_A, unique_B, shared, fillvalue=""):
+        ws.append(row)
+
+def results_fingerprint(la, lb, unique_A, unique_B, shared):
+    # short content hash (stable across runs/processes, unlike hash()) → CSV name
+    h = hashlib.sha1()
+    for part in ([la, lb], unique_A, unique_B, shared):
+        h.update("\x1f".join(part).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.hexdigest()[:10]
 
 # ---------- app state ----------
 class AppState:
     def __init__(self):
         self.wb_path = None
+        self.excel_file = None    # open workbook handle; sheets are read on demand
         self.sheets = []          # list[str]
-        self.dfs = {}             # name -> DataFrame
+        self.raw_cols = {}        # name -> (colA, colB) lists of str (read sheets only)
         self.labels = {}          # name -> (labelA, labelB) editable
         self.headers = {}         # name -> (orig_headerA, orig_headerB)
+        self.set_cache = {}       # name -> (unique_A, unique_B, shared)
         self.idx = 0
 
+        # live canvas: animated Venn artists + blit background (sans artists)
+        self.artists = None
+        self.bg = None
+        self.save_fig = None      # off-screen figure reused by save paths
+        self.save_ax = None
+
+        # Tk variables bound to the label entries (created with the UI)
+        self.var_labelA = None
+        self.var_labelB = None
+
         # visuals
         self.colorA = "#f4c27a"
         self.colorB = "#a6d49f"
@@ -91,66 +136,258 @@ class AppState:
         self.label_y = 1.12
 
     def has_data(self):
-        return bool(self.dfs)
+        return bool(self.sheets)
 
 S = AppState()
 
+def open_workbook(path):
+    # .xlsx: openpyxl read-only (streams rows); legacy .xls: pandas/xlrd
+    if path.lower().endswith(".xls"):
+        return pd.ExcelFile(path)
+    from openpyxl import load_workbook as open_xlsx
+    return open_xlsx(path, read_only=True, data_only=True)
+
+# pandas' default na_values for read_excel; the .xlsx reader drops the same
+# cells so "NA"/"#N/A" placeholders never count as genes (matches the .xls path)
+NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+})
+
+def sheet_names(book):
+    return book.sheet_names if isinstance(book, pd.ExcelFile) else book.sheetnames
+
+def sheet_ncols(book, name):
+    # column count from workbook metadata (no read), or None if unknown.
+    # Only xlrd's ncols is trusted: openpyxl's read-only max_column comes from
+    # the <dimension> tag, which some writers leave stale (e.g. ref="A1").
+    if not isinstance(book, pd.ExcelFile):
+        return None
+    try:
+        return book.book.sheet_by_name(name).ncols
+    except Exception:
+        return None
+
+def read_sheet(book, name):
+    # → (hdrA, hdrB, colA, colB) with non-NA cells as str, or None if < 2 columns.
+    # Cells are interned on ingest: repeats share one object and set-ops
+    # hit the identity fast path when comparing.
+    if isinstance(book, pd.ExcelFile):
+        if book.parse(name, nrows=0).shape[1] < 2:
+            return None
+        df = book.parse(name, usecols=[0,1], dtype=str)
+        return (str(df.columns[0]), str(df.columns[1]),
+                list(map(sys.intern, df.iloc[:,0].dropna())),
+                list(map(sys.intern, df.iloc[:,1].dropna())))
+
+    ws = book[name]
+    ws.reset_dimensions()   # as pandas does: a stale <dimension> would cut rows off
+    rows = ws.iter_rows(values_only=True, max_col=2)
+    header = tuple(next(rows, ())) + (None, None)
+    A, B = [], []
+    for row in rows:
+        for col, v in zip((A, B), row):
+            if v is None: continue
+            v = str(v)
+            if v not in NA_STRINGS:
+                col.append(sys.intern(v))
+    if header[1] is None and not B:
+        return None
+    hdrA, hdrB = (f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header[:2]))
+    return hdrA, hdrB, A, B
+
+def register_sheet(name, hdrA, hdrB, colA, colB):
+    S.raw_cols[name] = (colA, colB)
+    S.headers.setdefault(name, (hdrA, hdrB))
+    S.labels.setdefault(name, [hdrA, hdrB])  # start editable with headers
+
+def get_cols(name):
+    # read on first use; None if the sheet lacks two columns
+    cols = S.raw_cols.get(name)
+    if cols is None:
+        sheet = read_sheet(S.excel_file, name)
+        if sheet is not None:
+            register_sheet(name, *sheet)
+            cols = S.raw_cols[name]
+    return cols
+
+def current_sheet():
+    # unusable (or unreadable) sheets only show up once parsed → drop them on first view
+    while S.sheets:
+        name = S.sheets[S.idx]
+        try:
+            cols = get_cols(name)
+        except Exception as e:
+            messagebox.showerror("Error reading sheet", f"Skipping sheet '{name}':\n{e}")
+            cols = None
+        if cols is not None:
+            return name
+        del S.sheets[S.idx]
+        S.idx = S.idx % len(S.sheets) if S.sheets else 0
+    return None
+
+def get_sets(name):
+    # set-ops depend only on the sheet data, so visual tweaks reuse them
+    cached = S.set_cache.get(name)
+    if cached is None:
+        cached = S.set_cache[name] = compute_sets(*get_cols(name))
+    return cached
+
+def save_axes():
+    # one off-screen Agg figure per process, reused (ax.clear) for every PNG;
+    # bare Figure so save workers never touch pyplot/Tk
+    if S.save_fig is None:
+        S.save_fig = Figure(figsize=(6,6))
+        FigureCanvasAgg(S.save_fig)
+        S.save_ax = S.save_fig.add_subplot()
+        # lay out once (title, fixed limits) instead of bbox_inches="tight",
+        # which costs an extra draw pass on every savefig
+        draw_symmetric(S.save_ax, 0, 0, 0, "", "", S.colorA, S.colorB, S.alpha, S.label_y)
+        S.save_fig.tight_layout()
+    return S.save_fig, S.save_ax
+
+def _render_one(job):
+    # one sheet → PNG + CSV; module-level so worker processes can unpickle it
+    name, sets, cols, la, lb, colorA, colorB, alpha, label_y, base_dir, ts = job
+    if sets is None:
+        sets = compute_sets(*cols)
+    uA, uB, sh = sets
+
+    # PNG and CSV share "<sheet>__<A>_vs_<B>_<hash>"; the PNG adds the save
+    # timestamp (colors/alpha may differ), the CSV is named by content only
+    la_safe = sanitize_filename(la); lb_safe = sanitize_filename(lb)
+    stem = (f"{sanitize_filename(name)}__{la_safe}_vs_{lb_safe}_"
+            f"{results_fingerprint(la, lb, uA, uB, sh)}")
+
+    # PNG
+    fig2, ax2 = save_axes()
+    draw_symmetric(ax2, len(uA), len(uB), len(sh), la, lb, colorA, colorB, alpha, label_y)
+    png_path = os.path.join(base_dir, f"{stem}_{ts}.png")
+    fig2.savefig(png_path, dpi=DPI)
+
+    # CSV: re-saving unchanged results keeps the existing file
+    csv_path = os.path.join(base_dir, f"{stem}.csv")
+    csv_written = not os.path.exists(csv_path)
+    if csv_written:
+        write_results_csv(csv_path, la, lb, uA, uB, sh)
+    return name, sets, png_path, csv_path, csv_written
+
+def job_work(job):
+    # rough in-process cost of _render_one: cells to set-op/write + one PNG
+    sets, cols = job[1], job[2]
+    return PNG_WORK + sum(map(len, sets if sets is not None else cols))
+
+# ---------- live plot (blitting) ----------
+def init_plot():
+    # build the artists once; every later tweak only updates + blits them
+    if S.artists is None:
+        S.artists = draw_symmetric(ax, 0, 0, 0, "", "", S.colorA, S.colorB, S.alpha, S.label_y,
+                                   animated=True)
+        canvas.draw_idle()
+
+def on_canvas_draw(event):
+    # full draws (first show, window resize) → recapture the static background.
+    # Whole figure, not ax.bbox: high/long labels extend past the axes
+    if S.artists is None: return
+    S.bg = canvas.copy_from_bbox(fig.bbox)
+    for a in S.artists:
+        ax.draw_artist(a)
+
+def redraw_fast(n_A, n_B, n_shared, la, lb):
+    circA, circB, txtA, txtB, cntA, cntB, cntS = S.artists
+    circA.set_facecolor(S.colorA); circB.set_facecolor(S.colorB)
+    circA.set_alpha(S.alpha);      circB.set_alpha(S.alpha)
+    txtA.set_text(la); txtA.set_y(VENN_R*S.label_y)
+    txtB.set_text(lb); txtB.set_y(VENN_R*S.label_y)
+    cntA.set_text(str(n_A)); cntB.set_text(str(n_B)); cntS.set_text(str(n_shared))
+
+    if S.bg is None: return   # a full draw is pending; it paints the artists
+    canvas.restore_region(S.bg)
+    for a in S.artists:
+        ax.draw_artist(a)
+    canvas.blit(fig.bbox)
+
 # ---------- UI callbacks ----------
 def load_workbook():
     path = filedialog.askopenfilename(title="Select Excel Workbook",
                                       filetypes=[("Excel files","*.xlsx *.xls")])
     if not path:
         return
+    wb = None
     try:
-        wb = pd.ExcelFile(path)
-        S.wb_path = path
-        S.sheets = []
-        S.dfs.clear()
-        S.labels.clear()
-        S.headers.clear()
-
-        for name in wb.sheet_names:
-            df = wb.parse(name)
-            if df.shape[1] >= 2:
-                S.sheets.append(name)
-                S.dfs[name] = df
-                hdrA, hdrB = str(df.columns[0]), str(df.columns[1])
-                S.headers[name] = (hdrA, hdrB)
-                S.labels[name]  = [hdrA, hdrB]  # start editable with headers
-
-        if not S.sheets:
+        wb = open_workbook(path)
+
+        # only names up front; sheets are parsed when first viewed/saved
+        sheets = []
+        for name in sheet_names(wb):
+            ncols = sheet_ncols(wb, name)
+            if ncols is None or ncols >= 2:
+                sheets.append(name)
+
+        # read the first usable sheet before touching app state, so a bad
+        # workbook leaves the current one loaded
+        first = None
+        while sheets and first is None:
+            first = read_sheet(wb, sheets[0])
+            if first is None:
+                del sheets[0]
+        if first is None:
+            wb.close()
             messagebox.showerror("No usable sheets",
                                  "No sheets with at least two columns (A & B) found.")
             return
-
-        S.idx = 0
-        refresh_sheet_ui()
-        messagebox.showinfo("Loaded",
-                            f"Loaded {os.path.basename(path)}\n"
-                            f"{len(S.sheets)} sheet(s) ready.")
     except Exception as e:
+        if wb is not None:
+            wb.close()
         messagebox.showerror("Error loading workbook", str(e))
+        return
+
+    if S.excel_file is not None:
+        S.excel_file.close()
+    S.wb_path = path
+    S.excel_file = wb
+    S.raw_cols.clear()
+    S.set_cache.clear()
+    S.labels.clear()
+    S.headers.clear()
+    S.sheets = sheets
+    S.idx = 0
+    register_sheet(sheets[0], *first)
+
+    init_plot()
+    refresh_sheet_ui()
+    messagebox.showinfo("Loaded",
+                        f"Loaded {os.path.basename(path)}\n"
+                        f"{len(S.sheets)} sheet(s) ready.")
 
 def refresh_sheet_ui():
+    # sheet/workbook/label changes; visual-only tweaks call _refresh_plot()
+    if _refresh_sheet_meta():
+        _refresh_plot()
+
+def _refresh_plot():
     if not S.has_data(): return
     name = S.sheets[S.idx]
-    df = S.dfs[name]
+    la, lb = S.labels[name]
+    uA, uB, sh = get_sets(name)
+    redraw_fast(len(uA), len(uB), len(sh), la, lb)
+
+def _refresh_sheet_meta():
+    name = current_sheet()
+    if name is None: return False
     la, lb = S.labels[name]
 
     lbl_file.config(text=f"Workbook: {os.path.basename(S.wb_path) if S.wb_path else ''}")
     lbl_sheet.config(text=f"Sheet [{S.idx+1}/{len(S.sheets)}]: {name}")
 
-    entry_labelA.delete(0, tk.END); entry_labelA.insert(0, la)
-    entry_labelB.delete(0, tk.END); entry_labelB.insert(0, lb)
+    S.var_labelA.set(la)
+    S.var_labelB.set(lb)
 
     # preview counts
-    setA, setB, uA, uB, sh = compute_sets(df.iloc[:,0], df.iloc[:,1])
+    uA, uB, sh = get_sets(name)
     lbl_preview.config(text=f"Preview — Unique A: {len(uA)} | Shared: {len(sh)} | Unique B: {len(uB)}")
 
-    # redraw plot
-    draw_symmetric(ax, setA, setB, la, lb, S.colorA, S.colorB, S.alpha, S.label_y)
-    canvas.draw()
-
     # show lists in panel (trim super long to keep UI snappy)
     def preview_list(name_tag, L):
         head = L[:50]
@@ -161,12 +398,13 @@ def refresh_sheet_ui():
     output_box.insert(tk.END, preview_list(f"Unique to {lb}", uB))
     output_box.insert(tk.END, preview_list("Shared", sh))
     output_box.config(state="disabled")
+    return True
 
 def apply_label_changes():
     if not S.has_data(): return
     name = S.sheets[S.idx]
-    la = entry_labelA.get().strip() or S.headers[name][0]
-    lb = entry_labelB.get().strip() or S.headers[name][1]
+    la = S.var_labelA.get().strip() or S.headers[name][0]
+    lb = S.var_labelB.get().strip() or S.headers[name][1]
     S.labels[name] = [la, lb]
     refresh_sheet_ui()
 
@@ -181,14 +419,14 @@ def pick_colorA():
     if c:
         S.colorA = c
         btn_colorA.configure(bg=c, activebackground=c)
-        refresh_sheet_ui()
+        _refresh_plot()
 
 def pick_colorB():
     c = colorchooser.askcolor(title="Pick color for Set B (right)", color=S.colorB)[1]
     if c:
         S.colorB = c
         btn_colorB.configure(bg=c, activebackground=c)
-        refresh_sheet_ui()
+        _refresh_plot()
 
 def update_alpha_labely():
     try:
@@ -198,7 +436,7 @@ def update_alpha_labely():
         if ly < 0.9 or ly > 1.6:   raise ValueError
         S.alpha = a
         S.label_y = ly
-        refresh_sheet_ui()
+        _refresh_plot()
     except Exception:
         messagebox.showerror("Invalid values", "Alpha must be 0–1 and label height ~0.9–1.6")
 
@@ -215,29 +453,18 @@ def next_sheet():
 def save_current_sheet():
     if not S.has_data(): return
     name = S.sheets[S.idx]
-    df = S.dfs[name]
     la, lb = S.labels[name]
-    setA, setB, uA, uB, sh = compute_sets(df.iloc[:,0], df.iloc[:,1])
+    uA, uB, sh = get_sets(name)
 
     ts = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
     base_dir = os.path.join(os.path.dirname(S.wb_path), "Venn_Outputs")
     os.makedirs(base_dir, exist_ok=True)
 
-    la_safe = sanitize_filename(la); lb_safe = sanitize_filename(lb)
-    base = f"{sanitize_filename(name)}__{la_safe}_vs_{lb_safe}_{ts}"
-
-    # save PNG
-    fig2, ax2 = plt.subplots(figsize=(6,6))
-    draw_symmetric(ax2, setA, setB, la, lb, S.colorA, S.colorB, S.alpha, S.label_y)
-    png_path = os.path.join(base_dir, base + ".png")
-    fig2.savefig(png_path, dpi=150, bbox_inches="tight")
-    plt.close(fig2)
+    _, _, png_path, csv_path, csv_written = _render_one(
+        (name, (uA, uB, sh), None, la, lb, S.colorA, S.colorB, S.alpha, S.label_y, base_dir, ts))
 
-    # save CSV
-    csv_path = os.path.join(base_dir, base + ".csv")
-    to_results_df(la, lb, uA, uB, sh).to_csv(csv_path, index=False)
-
-    messagebox.showinfo("Saved", f"Saved PNG:\n{png_path}\n\nSaved CSV:\n{csv_path}")
+    csv_note = "Saved CSV" if csv_written else "CSV unchanged, kept existing"
+    messagebox.showinfo("Saved", f"Saved PNG:\n{png_path}\n\n{csv_note}:\n{csv_path}")
 
 def save_all_sheets():
     if not S.has_data(): return
@@ -247,111 +474,190 @@ def save_all_sheets():
 
     # optional combined workbook
     combined = combined_var.get() == 1
-    writer = None
+    wb_out = None
     xlsx_path = None
     if combined:
         try:
+            from openpyxl import Workbook
             xlsx_path = os.path.join(base_dir, f"venn_batch_results_{ts}.xlsx")
-            writer = pd.ExcelWriter(xlsx_path, engine="openpyxl")
+            wb_out = Workbook(write_only=True)
         except Exception:
-            writer = None
+            wb_out = None
             messagebox.showwarning("Combined Excel",
                                    "openpyxl not available; skipping combined workbook.\nRun: pip install openpyxl")
 
-    done = 0
+    # snapshot everything the batch needs; the worker thread never reads live state.
+    # Sheets not viewed yet carry neither sets nor columns (parsed on the thread).
+    jobs = []
     for name in S.sheets:
-        df = S.dfs[name]
-        if df.shape[1] < 2: continue
-        la, lb = S.labels[name]
-        setA, setB, uA, uB, sh = compute_sets(df.iloc[:,0], df.iloc[:,1])
-
-        la_safe = sanitize_filename(la); lb_safe = sanitize_filename(lb)
-        base = f"{sanitize_filename(name)}__{la_safe}_vs_{lb_safe}_{ts}"
-
-        # PNG
-        fig2, ax2 = plt.subplots(figsize=(6,6))
-        draw_symmetric(ax2, setA, setB, la, lb, S.colorA, S.colorB, S.alpha, S.label_y)
-        png_path = os.path.join(base_dir, base + ".png")
-        fig2.savefig(png_path, dpi=150, bbox_inches="tight")
-        plt.close(fig2)
-
-        # CSV
-        csv_path = os.path.join(base_dir, base + ".csv")
-        df_out = to_results_df(la, lb, uA, uB, sh)
-        df_out.to_csv(csv_path, index=False)
-
-        if writer is not None:
-            safe_sheet = sanitize_filename(name)[:31] or f"Sheet{done+1}"
-            try:
-                df_out.to_excel(writer, sheet_name=safe_sheet, index=False)
-            except Exception:
-                pass
-        done += 1
-
-    if writer is not None:
+        la, lb = S.labels.get(name, (None, None))
+        cached = S.set_cache.get(name)
+        cols = None if cached is not None else S.raw_cols.get(name)
+        jobs.append((name, cached, cols, la, lb, S.colorA, S.colorB, S.alpha, S.label_y,
+                     base_dir, ts))
+
+    # Save Current shares the process-wide save figure with a small batch
+    # (rendered on the worker thread), so both stay off until it's done
+    btn_save_all.config(state="disabled")
+    btn_save_current.config(state="disabled")
+    threading.Thread(target=_save_all_worker,
+                     args=(jobs, S.wb_path, S.excel_file, wb_out, xlsx_path, base_dir),
+                     daemon=True).start()
+
+def _store_batch_sheet(token, name, sheet):
+    # Tk thread; skip if the workbook was reloaded while the batch ran
+    if S.excel_file is token and name not in S.raw_cols:
+        register_sheet(name, *sheet)
+
+def _store_batch_sets(token, name, sets):
+    if S.excel_file is token:
+        S.set_cache.setdefault(name, sets)
+
+def _save_all_done(title, msg, warn=False):
+    btn_save_all.config(state="normal")
+    btn_save_current.config(state="normal")
+    lbl_status.config(text="")
+    (messagebox.showwarning if warn else messagebox.showinfo)(title, msg)
+
+def _save_all_worker(jobs, wb_path, token, wb_out, xlsx_path, base_dir):
+    # runs off the Tk thread: widgets/app state are only touched via root.after
+    total = len(jobs)   # upper bound; unusable sheets are skipped in ready_jobs
+    labels = {}
+    wb = None   # own workbook handle; the UI's one stays on the Tk thread
+
+    def ready_jobs():
+        nonlocal wb
+        for job in jobs:
+            name, sets, cols, la, lb = job[:5]
+            if sets is None and cols is None:
+                if wb is None:
+                    wb = open_workbook(wb_path)
+                sheet = read_sheet(wb, name)
+                if sheet is None: continue
+                root.after(0, _store_batch_sheet, token, name, sheet)
+                la, lb, *cols = sheet
+            labels[name] = (la, lb)
+            yield (name, sets, cols, la, lb) + job[5:]
+
+    ex = None
+    done = 0
+    try:
+        # sheets are independent → render PNG+CSV across processes; the
+        # combined workbook is still written here, in the main process.
+        # Spawning + importing workers costs ~1s, so small batches stay
+        # in-process: buffer jobs until their work estimate clears the bar
+        pending = ready_jobs()
+        head = []
+        work = 0
+        for job in pending:
+            head.append(job)
+            work += job_work(job)
+            if work >= POOL_MIN_WORK: break
+        batch = itertools.chain(head, pending)
+        if total > 1 and work >= POOL_MIN_WORK:
+            # spawn (not fork) so workers never inherit the Tk interpreter
+            ex = ProcessPoolExecutor(max_workers=min(total, os.cpu_count() or 1),
+                                     mp_context=multiprocessing.get_context("spawn"))
+            results = ex.map(_render_one, batch)
+        else:
+            results = map(_render_one, batch)
+
+        for name, sets, *_ in results:
+            la, lb = labels[name]
+            if wb_out is not None:
+                safe_sheet = sanitize_filename(name)[:31] or f"Sheet{done+1}"
+                try:
+                    write_results_sheet(wb_out, safe_sheet, la, lb, *sets)
+                except Exception:
+                    pass
+            root.after(0, _store_batch_sets, token, name, sets)
+            done += 1
+            # labels holds one entry per job actually yielded (both paths consume
+            # ready_jobs up front), so unusable sheets don't inflate the total
+            root.after(0, lambda n=done, t=len(labels): lbl_status.config(text=f"Saving {n}/{t}…"))
+    except Exception as e:
+        root.after(0, _save_all_done, "Save failed", f"Stopped after {done} sheet(s):\n{e}", True)
+        return
+    finally:
+        if ex is not None:
+            ex.shutdown()
+        if wb is not None:
+            wb.close()
+
+    if wb_out is not None:
         try:
-            writer.close()
-            messagebox.showinfo("Saved",
-                                f"Saved {done} sheet(s).\nCombined workbook:\n{xlsx_path}")
+            wb_out.save(xlsx_path)
+            root.after(0, _save_all_done, "Saved",
+                       f"Saved {done} sheet(s).\nCombined workbook:\n{xlsx_path}")
         except Exception:
-            messagebox.showwarning("Combined Excel", "Failed to finalize combined workbook.")
+            root.after(0, _save_all_done, "Combined Excel", "Failed to finalize combined workbook.", True)
     else:
-        messagebox.showinfo("Saved", f"Saved {done} sheet(s) PNG+CSV in:\n{base_dir}")
+        root.after(0, _save_all_done, "Saved", f"Saved {done} sheet(s) PNG+CSV in:\n{base_dir}")
 
 # ---------- build UI ----------
-root = tk.Tk()
-root.title("Gene Venn (Excel → Multi-sheet, Symmetric)")
-
-# File + sheet header
-frm_top = tk.Frame(root); frm_top.pack(padx=8, pady=6, fill="x")
-tk.Button(frm_top, text="Load Excel Workbook", command=load_workbook).grid(row=0, column=0, padx=6, sticky="w")
-lbl_file = tk.Label(frm_top, text="Workbook: —"); lbl_file.grid(row=0, column=1, padx=6, sticky="w")
-lbl_sheet = tk.Label(frm_top, text="Sheet: —"); lbl_sheet.grid(row=1, column=0, columnspan=2, padx=6, sticky="w")
-lbl_preview = tk.Label(frm_top, text="Preview — Unique A: - | Shared: - | Unique B: -")
-lbl_preview.grid(row=2, column=0, columnspan=3, padx=6, sticky="w")
-
-# Labels / colors / alpha / label height
-frm_ctrl = tk.Frame(root); frm_ctrl.pack(padx=8, pady=6, fill="x")
-tk.Label(frm_ctrl, text="Label A").grid(row=0, column=0, sticky="e")
-entry_labelA = tk.Entry(frm_ctrl, width=30); entry_labelA.grid(row=0, column=1, padx=4)
-tk.Label(frm_ctrl, text="Label B").grid(row=1, column=0, sticky="e")
-entry_labelB = tk.Entry(frm_ctrl, width=30); entry_labelB.grid(row=1, column=1, padx=4)
-tk.Button(frm_ctrl, text="Apply Labels", command=apply_label_changes).grid(row=0, column=2, padx=6)
-tk.Button(frm_ctrl, text="Reset to Excel Headers", command=reset_labels_to_headers).grid(row=1, column=2, padx=6)
-
-tk.Label(frm_ctrl, text="Color A").grid(row=0, column=3, sticky="e")
-btn_colorA = tk.Button(frm_ctrl, text="Pick…", width=8, command=pick_colorA, bg=S.colorA, activebackground=S.colorA)
-btn_colorA.grid(row=0, column=4, padx=4)
-tk.Label(frm_ctrl, text="Color B").grid(row=1, column=3, sticky="e")
-btn_colorB = tk.Button(frm_ctrl, text="Pick…", width=8, command=pick_colorB, bg=S.colorB, activebackground=S.colorB)
-btn_colorB.grid(row=1, column=4, padx=4)
-
-tk.Label(frm_ctrl, text="Alpha (0–1)").grid(row=0, column=5, sticky="e")
-entry_alpha = tk.Entry(frm_ctrl, width=6); entry_alpha.insert(0, str(S.alpha))
-entry_alpha.grid(row=0, column=6, padx=4)
-tk.Label(frm_ctrl, text="Label Height").grid(row=1, column=5, sticky="e")
-entry_labely = tk.Entry(frm_ctrl, width=6); entry_labely.insert(0, str(S.label_y))
-entry_labely.grid(row=1, column=6, padx=4)
-tk.Button(frm_ctrl, text="Apply Alpha/Height", command=update_alpha_labely).grid(row=0, column=7, rowspan=2, padx=6)
-
-# Navigation + save
-frm_nav = tk.Frame(root); frm_nav.pack(padx=8, pady=6, fill="x")
-tk.Button(frm_nav, text="⟨ Prev", width=10, command=prev_sheet).grid(row=0, column=0, padx=4)
-tk.Button(frm_nav, text="Next ⟩", width=10, command=next_sheet).grid(row=0, column=1, padx=4)
-tk.Button(frm_nav, text="Save Current (PNG+CSV)", command=save_current_sheet).grid(row=0, column=2, padx=10)
-combined_var = tk.IntVar(value=1)
-tk.Checkbutton(frm_nav, text="Also write combined Excel", variable=combined_var).grid(row=0, column=3, padx=8)
-tk.Button(frm_nav, text="Save ALL Sheets", command=save_all_sheets).grid(row=0, column=4, padx=10)
-
-# Plot canvas
-frm_plot = tk.Frame(root); frm_plot.pack(padx=8, pady=6)
-fig, ax = plt.subplots(figsize=(5.8,5.8))
-canvas = FigureCanvasTkAgg(fig, master=frm_plot)
-canvas.get_tk_widget().pack()
-
-# Output panel
-tk.Label(root, text="Preview lists (first 50 each):").pack(anchor="w", padx=8)
-output_box = scrolledtext.ScrolledText(root, width=100, height=14, state="disabled")
-output_box.pack(padx=8, pady=6)
-
-root.mainloop()
+# guarded so spawned save workers can import this module without a window
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    root = tk.Tk()
+    root.title("Gene Venn (Excel → Multi-sheet, Symmetric)")
+
+    # File + sheet header
+    frm_top = tk.Frame(root); frm_top.pack(padx=8, pady=6, fill="x")
+    tk.Button(frm_top, text="Load Excel Workbook", command=load_workbook).grid(row=0, column=0, padx=6, sticky="w")
+    lbl_file = tk.Label(frm_top, text="Workbook: —"); lbl_file.grid(row=0, column=1, padx=6, sticky="w")
+    lbl_sheet = tk.Label(frm_top, text="Sheet: —"); lbl_sheet.grid(row=1, column=0, columnspan=2, padx=6, sticky="w")
+    lbl_preview = tk.Label(frm_top, text="Preview — Unique A: - | Shared: - | Unique B: -")
+    lbl_preview.grid(row=2, column=0, columnspan=3, padx=6, sticky="w")
+
+    # Labels / colors / alpha / label height
+    frm_ctrl = tk.Frame(root); frm_ctrl.pack(padx=8, pady=6, fill="x")
+    tk.Label(frm_ctrl, text="Label A").grid(row=0, column=0, sticky="e")
+    S.var_labelA = tk.StringVar(); S.var_labelB = tk.StringVar()
+    entry_labelA = tk.Entry(frm_ctrl, width=30, textvariable=S.var_labelA); entry_labelA.grid(row=0, column=1, padx=4)
+    tk.Label(frm_ctrl, text="Label B").grid(row=1, column=0, sticky="e")
+    entry_labelB = tk.Entry(frm_ctrl, width=30, textvariable=S.var_labelB); entry_labelB.grid(row=1, column=1, padx=4)
+    tk.Button(frm_ctrl, text="Apply Labels", command=apply_label_changes).grid(row=0, column=2, padx=6)
+    tk.Button(frm_ctrl, text="Reset to Excel Headers", command=reset_labels_to_headers).grid(row=1, column=2, padx=6)
+
+    tk.Label(frm_ctrl, text="Color A").grid(row=0, column=3, sticky="e")
+    btn_colorA = tk.Button(frm_ctrl, text="Pick…", width=8, command=pick_colorA, bg=S.colorA, activebackground=S.colorA)
+    btn_colorA.grid(row=0, column=4, padx=4)
+    tk.Label(frm_ctrl, text="Color B").grid(row=1, column=3, sticky="e")
+    btn_colorB = tk.Button(frm_ctrl, text="Pick…", width=8, command=pick_colorB, bg=S.colorB, activebackground=S.colorB)
+    btn_colorB.grid(row=1, column=4, padx=4)
+
+    tk.Label(frm_ctrl, text="Alpha (0–1)").grid(row=0, column=5, sticky="e")
+    entry_alpha = tk.Entry(frm_ctrl, width=6); entry_alpha.insert(0, str(S.alpha))
+    entry_alpha.grid(row=0, column=6, padx=4)
+    tk.Label(frm_ctrl, text="Label Height").grid(row=1, column=5, sticky="e")
+    entry_labely = tk.Entry(frm_ctrl, width=6); entry_labely.insert(0, str(S.label_y))
+    entry_labely.grid(row=1, column=6, padx=4)
+    tk.Button(frm_ctrl, text="Apply Alpha/Height", command=update_alpha_labely).grid(row=0, column=7, rowspan=2, padx=6)
+
+    # Navigation + save
+    frm_nav = tk.Frame(root); frm_nav.pack(padx=8, pady=6, fill="x")
+    tk.Button(frm_nav, text="⟨ Prev", width=10, command=prev_sheet).grid(row=0, column=0, padx=4)
+    tk.Button(frm_nav, text="Next ⟩", width=10, command=next_sheet).grid(row=0, column=1, padx=4)
+    btn_save_current = tk.Button(frm_nav, text="Save Current (PNG+CSV)", command=save_current_sheet)
+    btn_save_current.grid(row=0, column=2, padx=10)
+    combined_var = tk.IntVar(value=1)
+    tk.Checkbutton(frm_nav, text="Also write combined Excel", variable=combined_var).grid(row=0, column=3, padx=8)
+    btn_save_all = tk.Button(frm_nav, text="Save ALL Sheets", command=save_all_sheets)
+    btn_save_all.grid(row=0, column=4, padx=10)
+    lbl_status = tk.Label(frm_nav, text=""); lbl_status.grid(row=0, column=5, padx=6, sticky="w")
+
+    # Plot canvas
+    frm_plot = tk.Frame(root); frm_plot.pack(padx=8, pady=6)
+    fig = Figure(figsize=(5.8,5.8)); ax = fig.add_subplot()
+    canvas = FigureCanvasTkAgg(fig, master=frm_plot)
+    canvas.get_tk_widget().pack()
+    canvas.mpl_connect("draw_event", on_canvas_draw)
+
+    # Output panel
+    tk.Label(root, text="Preview lists (first 50 each):").pack(anchor="w", padx=8)
+    output_box = scrolledtext.ScrolledText(root, width=100, height=14, state="disabled")
+    output_box.pack(padx=8, pady=6)
+
+    root.mainloop()